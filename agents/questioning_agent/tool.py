@@ -1,7 +1,9 @@
 # agents/questioning_agent/tool.py
-import json
 import re
-from typing import List, Dict
+import orjson
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Dict, Mapping
 from agentcore import LLMClient, BaseTool, auto_wrap_error
 from config.runtime_config import RuntimeConfig
 
@@ -16,6 +18,13 @@ class QuestioningAgentTool(BaseTool):
     - Generating followup questions (with options if needed)
     - Compressing conversation history
     """
+
+    # Shared read-only result for every "no followup" decision
+    _NO_FOLLOWUP = MappingProxyType({
+        "need_followup": False,
+        "followup_question": None,
+        "options": None
+    })
     
     def __init__(self, client: LLMClient):
         super().__init__()
@@ -25,6 +34,12 @@ class QuestioningAgentTool(BaseTool):
     def _sanitize_text(text: str) -> str:
         return "".join(ch for ch in text if not (0xD800 <= ord(ch) <= 0xDFFF))
 
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _sanitize_system_prompt(text: str) -> str:
+        # The same stage prompts are sent on every turn; scrub each one once
+        return QuestioningAgentTool._sanitize_text(text)
+
     @staticmethod
     def _expand_option_answer(answer: str, options: List[str] | None) -> str:
         if not answer or not options:
@@ -205,6 +220,29 @@ class QuestioningAgentTool(BaseTool):
         
         return answer
     
+    @staticmethod
+    def _format_followup_history(original_question: str, conversation_history: List[Dict[str, str]]) -> str:
+        """Render the original question and each turn, oldest first, for the followup check."""
+        parts = [f"Original question: {original_question}\n\n"]
+        for i, turn in enumerate(conversation_history, 1):
+            parts.append(f"Turn {i}:\nQuestion: {turn['question']}\n")
+            if turn.get("options"):
+                parts.append("Options:\n")
+                parts.extend(f"  {opt}\n" for opt in turn["options"])
+            parts.append(f"User's answer: {turn['answer']}\n\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _format_compress_history(conversation_history: List[Dict[str, str]]) -> str:
+        """Render each turn as a numbered Q/A block for the compression prompt."""
+        parts = []
+        for i, turn in enumerate(conversation_history, 1):
+            parts.append(f"{i}. Q: {turn['question']}\n")
+            if turn.get("options"):
+                parts.append(f"   選項：{', '.join(turn['options'])}\n")
+            parts.append(f"   A: {turn['answer']}\n\n")
+        return "".join(parts)
+
     @auto_wrap_error
     def _check_followup_needed(
         self,
@@ -213,7 +251,7 @@ class QuestioningAgentTool(BaseTool):
         conversation_history: List[Dict[str, str]],
         followup_count: int,
         max_followup: int
-    ) -> Dict[str, any]:
+    ) -> Mapping[str, Any]:
         """
         Use LLM to determine if a followup question is needed.
         
@@ -225,29 +263,19 @@ class QuestioningAgentTool(BaseTool):
             max_followup: Maximum allowed followup count
             
         Returns:
-            Dict with:
+            Read-only mapping (may be shared between calls; do not modify) with:
                 - need_followup: bool (whether followup is needed)
                 - followup_question: str or None (the followup question if needed)
                 - options: List[str] or None (list of options if this is a multiple choice followup)
         """
         # If already at max followup, no more followups
         if followup_count >= max_followup:
-            return {
-                "need_followup": False,
-                "followup_question": None,
-                "options": None
-            }
+            return self._NO_FOLLOWUP
         
-        # Construct user prompt for LLM to decide
-        formatted_history = f"Original question: {original_question}\n\n"
-        for i, turn in enumerate(conversation_history, 1):
-            formatted_history += f"Turn {i}:\n"
-            formatted_history += f"Question: {turn['question']}\n"
-            if turn.get("options"):
-                formatted_history += "Options:\n"
-                for opt in turn["options"]:
-                    formatted_history += f"  {opt}\n"
-            formatted_history += f"User's answer: {turn['answer']}\n\n"
+        # Construct user prompt for LLM to decide. History goes first and only
+        # grows by appending turns; the per-call counters stay at the end so
+        # successive checks for one question share a prompt prefix.
+        formatted_history = self._format_followup_history(original_question, conversation_history)
 
         user_prompt = f"""<user_prompt>
         {formatted_history}Current followup count: {followup_count}
@@ -257,7 +285,7 @@ class QuestioningAgentTool(BaseTool):
         </user__prompt>"""
 
         user_prompt = self._sanitize_text(user_prompt)
-        system_prompt = self._sanitize_text(system_prompt)
+        system_prompt = self._sanitize_system_prompt(system_prompt)
         
         # Configure for JSON output with strict schema
         config_override = {
@@ -305,8 +333,8 @@ class QuestioningAgentTool(BaseTool):
             raise Exception("LLM returned empty content")
         
         try:
-            result = json.loads(raw)
-        except json.JSONDecodeError as e:
+            result = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
             raise Exception(f"Failed to parse LLM response as JSON: {e}")
         
         # Validate response structure
@@ -353,11 +381,7 @@ class QuestioningAgentTool(BaseTool):
                 "options": options  # 可能是 list 或 None
             }
         else:
-            return {
-                "need_followup": False,
-                "followup_question": None,
-                "options": None
-            }
+            return self._NO_FOLLOWUP
     
     @auto_wrap_error
     def _compress_conversation(
@@ -381,12 +405,7 @@ class QuestioningAgentTool(BaseTool):
             Exception: If LLM call fails or returns invalid JSON
         """
         # Format conversation history
-        formatted_history = ""
-        for i, turn in enumerate(conversation_history, 1):
-            formatted_history += f"{i}. Q: {turn['question']}\n"
-            if turn.get("options"):
-                formatted_history += f"   選項：{', '.join(turn['options'])}\n"
-            formatted_history += f"   A: {turn['answer']}\n\n"
+        formatted_history = self._format_compress_history(conversation_history)
         
         # Construct user prompt
         user_prompt = f"""<user_prompt>
@@ -399,7 +418,7 @@ Original question: {original_question}
 </user__prompt>"""
 
         user_prompt = self._sanitize_text(user_prompt)
-        system_prompt = self._sanitize_text(system_prompt)
+        system_prompt = self._sanitize_system_prompt(system_prompt)
                 
         # Configure for JSON output with CoT
         config_override = {
@@ -421,8 +440,8 @@ Original question: {original_question}
             raise Exception("LLM returned empty content")
         
         try:
-            result = json.loads(raw)
-        except json.JSONDecodeError as e:
+            result = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
             raise Exception(f"Failed to parse LLM response as JSON: {e}")
         
         # Expected format: {"思考過程": {...}, "compressed": "Q: ... A: ..."}
@@ -4,7 +4,7 @@ Configuration loader utility.
 Loads config.json and resolves all prompt file paths.
 """
 
-import json
+import orjson
 import os
 from typing import Dict, Any
 
@@ -31,14 +31,14 @@ def load_config(config_path: str = "config/json_config/config.json") -> Dict[str
             
     Raises:
         FileNotFoundError: If config file or prompt files not found
-        json.JSONDecodeError: If config file is invalid JSON
+        orjson.JSONDecodeError: If config file is invalid JSON (subclass of json.JSONDecodeError)
     """
     # Resolve prompt paths relative to the config root (parent of json_config)
     config_root = _get_config_root(config_path)
     
     # Load config.json
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    with open(config_path, 'rb') as f:
+        config = orjson.loads(f.read())
     
     # Resolve all prompt file paths
     stage_prompts = config.get("stage_prompts", {})
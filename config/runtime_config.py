@@ -4,14 +4,82 @@ Runtime configuration for managing global shared resources.
 This module holds singleton-like global objects that need to be accessed
 across different parts of the application.
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-class RuntimeConfig:
+_UNSET = object()
+
+
+class _RuntimeField:
+    """
+    Class-level attribute backed by a process-wide value and a context-local override.
+
+    Reads return the override when one is active in the current context,
+    otherwise the process-wide value. Assignments update whichever of the
+    two is currently in effect.
+    """
+
+    def __set_name__(self, owner, name):
+        # Bound on both the metaclass and RuntimeConfig; initialize only once
+        if hasattr(self, "var"):
+            return
+        self.value = None
+        self.var = ContextVar(f"RuntimeConfig.{name}", default=_UNSET)
+
+    def __get__(self, obj, owner=None):
+        value = self.var.get()
+        return self.value if value is _UNSET else value
+
+    def __set__(self, obj, value):
+        if self.var.get() is _UNSET:
+            self.value = value
+        else:
+            self.var.set(value)
+
+
+class _RuntimeConfigMeta(type):
+    cli_interface = _RuntimeField()
+    config_data = _RuntimeField()
+
+
+class RuntimeConfig(metaclass=_RuntimeConfigMeta):
     """
     Global runtime configuration and shared resources.
-    
+
     Attributes:
         cli_interface: Global CLI interface instance (real or mock)
         config_data: Loaded configuration data from config.json
     """
-    cli_interface = None
-    config_data = None
+
+    # The same fields, so instances and dir(RuntimeConfig) see them as well
+    cli_interface = vars(_RuntimeConfigMeta)["cli_interface"]
+    config_data = vars(_RuntimeConfigMeta)["config_data"]
+
+    @classmethod
+    @contextmanager
+    def override(cls, **values):
+        """
+        Temporarily replace runtime attributes for the current context only.
+
+        Threads and tasks started from inside the block inherit the override
+        when they copy the current context; other contexts keep seeing the
+        process-wide values. Also usable as a decorator.
+
+        Args:
+            **values: Attribute names (e.g. cli_interface, config_data) and their values
+
+        Raises:
+            Exception: If an unknown attribute name is given
+        """
+        fields = vars(type(cls))
+        tokens = []
+        try:
+            for name, value in values.items():
+                field = fields.get(name)
+                if not isinstance(field, _RuntimeField):
+                    raise Exception(f"Unknown RuntimeConfig attribute: {name}")
+                tokens.append((field.var, field.var.set(value)))
+            yield cls
+        finally:
+            for var, token in reversed(tokens):
+                var.reset(token)
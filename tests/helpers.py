@@ -0,0 +1,108 @@
+# tests/helpers.py
+"""
+Shared assertion helpers and test doubles for the automated tests.
+"""
+
+import re
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+import orjson
+
+LLM_MOCKS_DIR = Path(__file__).parent / "fixtures" / "llm_mocks"
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+@contextmanager
+def assert_raises(match: str, exc_type: type = Exception):
+    """
+    Assert that the block raises `exc_type` with a message matching `match`.
+
+    `match` is a case-insensitive regex searched in str(exception); it is
+    compiled once per pattern.
+    """
+    try:
+        yield
+    except exc_type as e:
+        if not _compile(match).search(str(e)):
+            raise AssertionError(f"Exception message {str(e)!r} does not match {match!r}") from e
+    else:
+        raise AssertionError("Should have raised exception")
+
+
+@lru_cache(maxsize=None)
+def load_llm_mocks(name: str) -> MappingProxyType:
+    """
+    Load canned LLM replies from tests/fixtures/llm_mocks/<name>.json (read once).
+
+    Each entry's `payload` is JSON-encoded into `content`, giving read-only
+    {"content", "tokens_in", "tokens_out"} responses keyed by entry name.
+    """
+    raw = orjson.loads((LLM_MOCKS_DIR / f"{name}.json").read_bytes())
+    return MappingProxyType({
+        key: MappingProxyType({
+            "content": orjson.dumps(entry["payload"]).decode(),
+            "tokens_in": entry["tokens_in"],
+            "tokens_out": entry["tokens_out"]
+        })
+        for key, entry in raw.items()
+    })
+
+
+class FakeCLI:
+    """
+    Scripted stand-in for CLIInterface.
+
+    get_user_input returns `answers` in order and records each
+    (prompt, options) pair in `inputs`; display methods do nothing.
+    """
+
+    def __init__(self, answers=()):
+        self._answers = iter(answers)
+        self.inputs = []
+
+    def get_user_input(self, prompt=None, options=None) -> str:
+        self.inputs.append((prompt, options))
+        return next(self._answers)
+
+    def update_stage(self, stage_idx, substage, question_idx=None, total_questions=None):
+        pass
+
+    def show_waiting_message(self, message=None):
+        pass
+
+    def clear_conversation(self):
+        pass
+
+
+class ScriptedClient:
+    """
+    Stand-in for LLMClient that replays scripted invoke() responses in order.
+
+    The keyword arguments of every call are recorded in `calls`.
+    """
+
+    def __init__(self, responses=()):
+        self._responses = deque(responses)
+        self.calls = []
+
+    def reset(self, responses=()) -> "ScriptedClient":
+        """Drop recorded calls and queue a new script."""
+        self._responses = deque(responses)
+        self.calls = []
+        return self
+
+    @property
+    def call_count(self) -> int:
+        return len(self.calls)
+
+    def invoke(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        return self._responses.popleft()
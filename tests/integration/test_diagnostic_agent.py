@@ -6,7 +6,7 @@ Tests the complete agent including graph compilation and execution.
 """
 
 from unittest.mock import Mock
-from agentcore import test_wrapper
+from agentcore import LLMClient, test_wrapper
 from agents.diagnostic_agent import DiagnosticAgent
 
 
@@ -14,7 +14,7 @@ from agents.diagnostic_agent import DiagnosticAgent
 def test_diagnostic_agent_full_flow():
     """Test complete DiagnosticAgent flow from input to output"""
     # Setup mock LLM client
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": '{"questions": ["What is the target audience?", "What format is preferred?"]}',
         "tokens_in": 100,
@@ -50,7 +50,7 @@ def test_diagnostic_agent_full_flow():
 def test_diagnostic_agent_preserves_input_state():
     """Test that agent preserves input fields in state"""
     # Setup mock LLM client
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": '{"questions": ["Q1?", "Q2?"]}',
         "tokens_in": 50,
@@ -83,7 +83,7 @@ def test_diagnostic_agent_preserves_input_state():
 def test_diagnostic_agent_error_propagation():
     """Test that errors from tool are properly propagated"""
     # Setup mock LLM client that returns invalid response
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": "invalid json",
         "tokens_in": 10,
@@ -6,7 +6,7 @@ Tests the complete agent including graph compilation and execution.
 """
 
 from unittest.mock import Mock
-from agentcore import test_wrapper
+from agentcore import LLMClient, test_wrapper
 from agents.integration_agent import IntegrationAgent
 
 
@@ -14,7 +14,7 @@ from agents.integration_agent import IntegrationAgent
 def test_integration_agent_full_flow():
     """Test complete IntegrationAgent flow from input to output"""
     # Setup mock LLM client
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": '{"improved_prompt": "You are a programming tutor for beginners. Explain concepts in simple terms. Provide code examples in Python. Use step-by-step breakdowns."}',
         "tokens_in": 120,
@@ -61,7 +61,7 @@ def test_integration_agent_full_flow():
 def test_integration_agent_preserves_input_fields():
     """Test that agent preserves non-modified input fields"""
     # Setup mock LLM client
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": '{"improved_prompt": "Improved version of the prompt."}',
         "tokens_in": 50,
@@ -94,7 +94,7 @@ def test_integration_agent_preserves_input_fields():
 def test_integration_agent_with_empty_answers():
     """Test agent behavior with empty answer list"""
     # Setup mock LLM client
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": '{"improved_prompt": "Prompt with minimal changes."}',
         "tokens_in": 30,
@@ -125,7 +125,7 @@ def test_integration_agent_with_empty_answers():
 def test_integration_agent_error_propagation():
     """Test that errors from tool are properly propagated"""
     # Setup mock LLM client that returns invalid response
-    mock_client = Mock()
+    mock_client = Mock(spec=LLMClient)
     mock_client.invoke.return_value = {
         "content": "not json",
         "tokens_in": 10,
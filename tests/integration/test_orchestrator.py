@@ -5,272 +5,325 @@ Integration tests for Orchestrator.
 Tests the complete orchestration flow across stages.
 """
 
-from unittest.mock import Mock, patch
-from agentcore import test_wrapper
+import threading
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch
+import orjson
+from agentcore import LLMClient, test_wrapper
 from agents.orchestrator import Orchestrator
+from cli.cli_interface import CLIInterface
 from config.runtime_config import RuntimeConfig
 
 
+# Read-only configs shared by every test in this module
+_STAGE_PROMPTS = MappingProxyType({
+    "diagnostic": "Diagnostic prompt",
+    "questioning_followup": "Followup prompt",
+    "questioning_compress": "Compress prompt",
+    "integration": "Integration prompt"
+})
+
+_CONFIG = MappingProxyType({
+    "max_followup_count": 2,
+    "stage_names": ("stage_1",),
+    "stage_prompts": MappingProxyType({"stage_1": _STAGE_PROMPTS})
+})
+
+_THREE_STAGE_CONFIG = MappingProxyType({
+    **_CONFIG,
+    "stage_names": ("stage_1", "stage_2", "stage_3"),
+    "stage_prompts": MappingProxyType({
+        name: _STAGE_PROMPTS for name in ("stage_1", "stage_2", "stage_3")
+    })
+})
+
+
+def _response(payload: dict, tokens_in: int, tokens_out: int) -> dict:
+    """Encode a parsed payload as a canned LLM reply (non-ASCII kept as UTF-8)."""
+    return {
+        "content": orjson.dumps(payload).decode(),
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out
+    }
+
+
+# Parsed payloads the mocked LLM answers with; tests assert against these
+_PAYLOADS = {
+    "diagnostic": {"questions": ["Test question?"]},
+    "diagnostic_three": {"questions": ["Q1?", "Q2?", "Q3?"]},
+    "followup": {"need_followup": False},
+    "compress": {"compressed": "Q: Test question? A: Test answer"},
+    "integration": {"improved_prompt": "Improved test prompt"},
+    "integration_final": {"improved_prompt": "Final improved prompt"}
+}
+
+# Canned LLM responses, keyed by the kind of prompt being answered
+_RESPONSES = {
+    "diagnostic": _response(_PAYLOADS["diagnostic"], 50, 20),
+    "followup": _response(_PAYLOADS["followup"], 40, 15),
+    "compress": _response(_PAYLOADS["compress"], 40, 15),
+    "integration": _response(_PAYLOADS["integration"], 60, 30)
+}
+
+# Every agent call carries its stage's system prompt, which names the caller
+_PROMPT_KIND = {
+    _STAGE_PROMPTS["diagnostic"]: "diagnostic",
+    _STAGE_PROMPTS["questioning_followup"]: "followup",
+    _STAGE_PROMPTS["questioning_compress"]: "compress",
+    _STAGE_PROMPTS["integration"]: "integration"
+}
+
+# The patched loader hands back whatever config the running test installed
+_LOAD_CONFIG = Mock(side_effect=lambda *args, **kwargs: RuntimeConfig.config_data)
+_config_patcher = None
+
+# Shared across tests and reset by _fresh_mocks()
+_MOCK_CLIENT = Mock(spec=LLMClient)
+_MOCK_CLI = Mock(spec=CLIInterface)
+
+
+def setup_module(module=None):
+    """Patch config loading once for every Orchestrator built in this module."""
+    global _config_patcher
+    _config_patcher = patch.multiple(
+        "agents.orchestrator.tool",
+        load_config=_LOAD_CONFIG,
+        validate_config=DEFAULT
+    )
+    _config_patcher.start()
+
+
+def teardown_module(module=None):
+    """Restore the real config loaders."""
+    global _config_patcher
+    if _config_patcher is not None:
+        _config_patcher.stop()
+        _config_patcher = None
+
+
+def _runtime(config: MappingProxyType = _CONFIG):
+    """Install `config` and the shared CLI mock for the decorated test only."""
+    return RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data=config)
+
+
+def _fresh_mocks() -> tuple[Mock, Mock]:
+    """Reset the shared LLM client and CLI mocks."""
+    for mock in (_MOCK_CLIENT, _MOCK_CLI):
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _MOCK_CLIENT, _MOCK_CLI
+
+
+def _lite_orchestrator(initial_prompt: str, config: MappingProxyType = _CONFIG) -> Orchestrator:
+    """Build an Orchestrator for node/routing tests without compiling subgraphs."""
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.initial_prompt = initial_prompt
+    orchestrator.tool = SimpleNamespace(
+        stage_names=config["stage_names"],
+        stage_prompts=config["stage_prompts"],
+        max_followup_count=config["max_followup_count"]
+    )
+    return orchestrator
+
+
+def _dispatch(responses: dict):
+    """Build an LLM invoke stub that answers from `responses` by prompt kind."""
+    def invoke(*args, system_prompt: str = "", **kwargs):
+        kind = _PROMPT_KIND.get(system_prompt)
+        if kind is None:
+            raise AssertionError(f"Unexpected system_prompt: {system_prompt}")
+        return responses[kind]
+    return invoke
+
+
 @test_wrapper
+@_runtime()
 def test_orchestrator_single_stage_flow():
     """Test orchestrator flow for a single stage with one question"""
-    # Setup mock config
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["test_stage"],
-        "stage_prompts": {
-            "test_stage": {
-                "diagnostic": "Diagnostic prompt",
-                "questioning": "Questioning prompt",
-                "integration": "Integration prompt"
-            }
-        }
-    }
-    
-    # Setup mock CLI
-    mock_cli = Mock()
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.return_value = "Test answer"
-    RuntimeConfig.cli_interface = mock_cli
-    RuntimeConfig.config_data = mock_config
     
-    # Setup mock LLM client
-    mock_client = Mock()
+    # Diagnostic -> followup check -> compress -> integration
+    mock_client.invoke.side_effect = _dispatch(_RESPONSES)
     
-    # Mock for DiagnosticAgent
-    mock_client.invoke.side_effect = [
-        # Diagnostic call - generate questions
-        {"content": '{"questions": ["Test question?"]}', "tokens_in": 50, "tokens_out": 20},
-        # Questioning followup check - no followup
-        {"content": '{"need_followup": false}', "tokens_in": 40, "tokens_out": 15},
-        # Integration call - improve prompt
-        {"content": '{"improved_prompt": "Improved test prompt"}', "tokens_in": 60, "tokens_out": 30}
-    ]
+    # Create orchestrator
+    orchestrator = Orchestrator(mock_client, "Initial test prompt")
+    compiled = orchestrator.compile()
     
-    # Patch config loading in OrchestratorTool
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            # Create orchestrator
-            orchestrator = Orchestrator(mock_client, "Initial test prompt")
-            compiled = orchestrator.compile()
-            
-            # Execute (will run one complete stage)
-            result = compiled.invoke({})
-            
-            # Verify flow completed
-            assert "current_prompt" in result
-            assert result["current_prompt"] == "Improved test prompt"
-            assert result["stage_idx"] == 2  # After update_stage, ready for next
-            
-            # Verify LLM was called for diagnostic, questioning check, and integration
-            assert mock_client.invoke.call_count >= 2
+    # Execute (will run one complete stage)
+    result = compiled.invoke({})
+    
+    # Verify flow completed
+    assert "current_prompt" in result
+    assert result["current_prompt"] == _PAYLOADS["integration"]["improved_prompt"]
+    assert result["stage_idx"] == 2  # After update_stage, ready for next
+    
+    # Verify LLM was called for diagnostic, questioning check, and integration
+    assert mock_client.invoke.call_count >= 2
 
 
 @test_wrapper
 def test_orchestrator_init_stage():
     """Test init_stage node behavior"""
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["stage_1"],
-        "stage_prompts": {"stage_1": {"diagnostic": "p", "questioning": "p", "integration": "p"}}
-    }
-    
-    RuntimeConfig.config_data = mock_config
+    orchestrator = _lite_orchestrator("Test initial prompt")
     
-    mock_client = Mock()
+    # Test init_stage behavior
+    state = {}
+    result = orchestrator.init_stage(state)
     
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            orchestrator = Orchestrator(mock_client, "Test initial prompt")
-            
-            # Test init_stage behavior
-            state = {}
-            result = orchestrator.init_stage(state)
-            
-            # Verify initialization
-            assert result["current_prompt"] == "Test initial prompt"
-            assert result["stage_idx"] == 1
-            assert result["question_list"] == []
-            assert result["answer_list"] == []
-            assert result["dialogue_idx"] == 0
-            assert result["followup_count"] == 0
+    # Verify initialization
+    assert result["current_prompt"] == "Test initial prompt"
+    assert result["stage_idx"] == 1
+    assert result["question_list"] == []
+    assert result["answer_list"] == []
+    assert result["dialogue_idx"] == 0
+    assert result["followup_count"] == 0
 
 
 @test_wrapper
 def test_orchestrator_route_after_diagnostic():
     """Test routing logic after diagnostic"""
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["stage_1"],
-        "stage_prompts": {"stage_1": {"diagnostic": "p", "questioning": "p", "integration": "p"}}
-    }
+    orchestrator = _lite_orchestrator("Test")
     
-    RuntimeConfig.config_data = mock_config
-    mock_client = Mock()
+    state1 = {"question_list": []}
+    route1 = orchestrator.route_after_diagnostic(state1)
+    assert route1 == "update_stage"
     
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            orchestrator = Orchestrator(mock_client, "Test")
-            
-            state1 = {"question_list": []}
-            route1 = orchestrator.route_after_diagnostic(state1)
-            assert route1 == "update_stage"
-            
-            state2 = {"question_list": ["Q1"]}
-            route2 = orchestrator.route_after_diagnostic(state2)
-            assert route2 == "call_questioning"
+    state2 = {"question_list": ["Q1"]}
+    route2 = orchestrator.route_after_diagnostic(state2)
+    assert route2 == "call_questioning"
 
 
 @test_wrapper
 def test_orchestrator_route_after_questioning():
     """Test routing logic after questioning"""
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["stage_1"],
-        "stage_prompts": {"stage_1": {"diagnostic": "p", "questioning": "p", "integration": "p"}}
-    }
+    orchestrator = _lite_orchestrator("Test")
     
-    RuntimeConfig.config_data = mock_config
-    mock_client = Mock()
+    # Test routing with more questions remaining
+    state1 = {
+        "dialogue_idx": 1,
+        "question_list": ["Q1", "Q2", "Q3"]
+    }
+    route1 = orchestrator.route_after_questioning(state1)
+    assert route1 == "call_questioning"
     
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            orchestrator = Orchestrator(mock_client, "Test")
-            
-            # Test routing with more questions remaining
-            state1 = {
-                "dialogue_idx": 1,
-                "question_list": ["Q1", "Q2", "Q3"]
-            }
-            route1 = orchestrator.route_after_questioning(state1)
-            assert route1 == "call_questioning"
-            
-            # Test routing with all questions answered
-            state2 = {
-                "dialogue_idx": 3,
-                "question_list": ["Q1", "Q2", "Q3"]
-            }
-            route2 = orchestrator.route_after_questioning(state2)
-            assert route2 == "call_integration"
+    # Test routing with all questions answered
+    state2 = {
+        "dialogue_idx": 3,
+        "question_list": ["Q1", "Q2", "Q3"]
+    }
+    route2 = orchestrator.route_after_questioning(state2)
+    assert route2 == "call_integration"
 
 
 @test_wrapper
 def test_orchestrator_route_after_integration():
     """Test routing logic after integration"""
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["stage_1", "stage_2", "stage_3"],
-        "stage_prompts": {
-            "stage_1": {"diagnostic": "p", "questioning": "p", "integration": "p"},
-            "stage_2": {"diagnostic": "p", "questioning": "p", "integration": "p"},
-            "stage_3": {"diagnostic": "p", "questioning": "p", "integration": "p"}
-        }
-    }
+    orchestrator = _lite_orchestrator("Test", _THREE_STAGE_CONFIG)
     
-    RuntimeConfig.config_data = mock_config
-    mock_client = Mock()
+    # Test routing with more stages remaining
+    state1 = {"stage_idx": 2}
+    route1 = orchestrator.route_after_integration(state1)
+    assert route1 == "init_stage"
     
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            orchestrator = Orchestrator(mock_client, "Test")
-            
-            # Test routing with more stages remaining
-            state1 = {"stage_idx": 2}
-            route1 = orchestrator.route_after_integration(state1)
-            assert route1 == "init_stage"
-            
-            # Test routing after final stage (stage_idx already incremented)
-            state2 = {"stage_idx": 4}
-            route2 = orchestrator.route_after_integration(state2)
-            from langgraph.graph import END
-            assert route2 == END
+    # Test routing after final stage (stage_idx already incremented)
+    state2 = {"stage_idx": 4}
+    route2 = orchestrator.route_after_integration(state2)
+    from langgraph.graph import END
+    assert route2 == END
             
 @test_wrapper
 def test_orchestrator_update_stage():
     """Test update_stage node behavior"""
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["stage_1"],
-        "stage_prompts": {"stage_1": {"diagnostic": "p", "questioning": "p", "integration": "p"}}
-    }
+    orchestrator = _lite_orchestrator("Test")
     
-    RuntimeConfig.config_data = mock_config
-    mock_client = Mock()
+    # Test stage update
+    state = {"stage_idx": 1}
+    result = orchestrator.update_stage(state)
     
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            orchestrator = Orchestrator(mock_client, "Test")
-            
-            # Test stage update
-            state = {"stage_idx": 1}
-            result = orchestrator.update_stage(state)
-            
-            assert result["stage_idx"] == 2
+    assert result["stage_idx"] == 2
 
 
 @test_wrapper
+@_runtime()
 def test_orchestrator_multiple_questions_per_stage():
     """Test handling multiple questions in a single stage"""
-    mock_config = {
-        "max_followup_count": 2,
-        "stage_names": ["test_stage"],
-        "stage_prompts": {
-            "test_stage": {
-                "diagnostic": "Diagnostic prompt",
-                "questioning": "Questioning prompt",
-                "integration": "Integration prompt"
-            }
-        }
-    }
-    
-    # Setup mock CLI to answer multiple questions
-    mock_cli = Mock()
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.side_effect = ["Answer 1", "Answer 2", "Answer 3"]
-    RuntimeConfig.cli_interface = mock_cli
-    RuntimeConfig.config_data = mock_config
+    mock_client.invoke.side_effect = _dispatch({
+        **_RESPONSES,
+        "diagnostic": _response(_PAYLOADS["diagnostic_three"], 50, 30),
+        "integration": _response(_PAYLOADS["integration_final"], 70, 35)
+    })
+
+    orchestrator = Orchestrator(mock_client, "Initial prompt")
+    compiled = orchestrator.compile()
     
-    # Setup mock LLM client
-    mock_client = Mock()
-
-    def mock_invoke(*args, **kwargs):
-        user_prompt = kwargs.get('user_prompt', '')
-        
-        # Diagnostic call
-        if "analyze" in user_prompt.lower():
-            return {"content": '{"questions": ["Q1?", "Q2?", "Q3?"]}', "tokens_in": 50, "tokens_out": 30}
-        
-        # Followup check
-        elif "need_followup" in user_prompt.lower() or "Original question" in user_prompt:
-            return {"content": '{"need_followup": false}', "tokens_in": 40, "tokens_out": 15}
-        
-        # Integration call
-        else:
-            return {"content": '{"improved_prompt": "Final improved prompt"}', "tokens_in": 70, "tokens_out": 35}
-
-    mock_client.invoke = mock_invoke
-    with patch('agents.orchestrator.tool.load_config', return_value=mock_config):
-        with patch('agents.orchestrator.tool.validate_config'):
-            orchestrator = Orchestrator(mock_client, "Initial prompt")
-            compiled = orchestrator.compile()
-            
-            result = compiled.invoke({})
-            
-            # Verify all questions were asked
-            assert mock_cli.get_user_input.call_count == 3
-            
-            # Verify final prompt updated
-            assert result["current_prompt"] == "Final improved prompt"
+    result = compiled.invoke({})
+    
+    # Verify all questions were asked
+    assert mock_cli.get_user_input.call_count == len(_PAYLOADS["diagnostic_three"]["questions"])
+    
+    # Verify final prompt updated
+    assert result["current_prompt"] == _PAYLOADS["integration_final"]["improved_prompt"]
+
+
+@test_wrapper
+@_runtime()
+def test_orchestrator_batch_runs():
+    """Test independent runs batched through one compiled graph"""
+    # batch() runs on worker threads and Mock's call_count is not updated
+    # atomically, so record the asked questions under a lock instead
+    mock_client, mock_cli = _fresh_mocks()
+    asked = []
+    asked_lock = threading.Lock()
+
+    def answer(prompt=None, options=None):
+        with asked_lock:
+            asked.append(prompt)
+        return "Batched answer"
+
+    mock_cli.get_user_input.side_effect = answer
+    mock_client.invoke.side_effect = _dispatch({
+        **_RESPONSES,
+        "diagnostic": _response(_PAYLOADS["diagnostic_three"], 50, 30),
+        "integration": _response(_PAYLOADS["integration_final"], 70, 35)
+    })
+
+    orchestrator = Orchestrator(mock_client, "Initial prompt")
+    compiled = orchestrator.compile()
+    
+    runs = 4
+    results = compiled.batch(
+        [{} for _ in range(runs)],
+        config={"max_concurrency": 2}
+    )
+    
+    # Verify every run finished its stage independently
+    assert len(results) == runs
+    for result in results:
+        assert result["current_prompt"] == _PAYLOADS["integration_final"]["improved_prompt"]
+        assert result["stage_idx"] == 2
+    
+    # Verify each run asked every question
+    questions = len(_PAYLOADS["diagnostic_three"]["questions"])
+    assert len(asked) == runs * questions
 
 
 # Run all tests
 if __name__ == "__main__":
     print("Running Orchestrator integration tests...\n")
     
-    test_orchestrator_single_stage_flow()
-    test_orchestrator_init_stage()
-    test_orchestrator_route_after_diagnostic()
-    test_orchestrator_route_after_questioning()
-    test_orchestrator_route_after_integration()
-    test_orchestrator_update_stage()
-    test_orchestrator_multiple_questions_per_stage()
+    setup_module()
+    try:
+        test_orchestrator_single_stage_flow()
+        test_orchestrator_init_stage()
+        test_orchestrator_route_after_diagnostic()
+        test_orchestrator_route_after_questioning()
+        test_orchestrator_route_after_integration()
+        test_orchestrator_update_stage()
+        test_orchestrator_multiple_questions_per_stage()
+        test_orchestrator_batch_runs()
+    finally:
+        teardown_module()
     
-    print("\nAll tests completed!")
+    print("\nAll tests completed!")
\ No newline at end of file
@@ -6,24 +6,31 @@ Tests the complete agent including graph compilation and CLI interaction.
 """
 
 from unittest.mock import Mock
-from agentcore import test_wrapper
+from agentcore import LLMClient, test_wrapper
 from agents.questioning_agent import QuestioningAgent
+from cli.cli_interface import CLIInterface
 from config.runtime_config import RuntimeConfig
 
 
+# Shared across tests and reset by _fresh_mocks()
+_MOCK_CLIENT = Mock(spec=LLMClient)
+_MOCK_CLI = Mock(spec=CLIInterface)
+
+
+def _fresh_mocks() -> tuple[Mock, Mock]:
+    """Reset the shared LLM client and CLI mocks."""
+    for mock in (_MOCK_CLIENT, _MOCK_CLI):
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _MOCK_CLIENT, _MOCK_CLI
+
+
 @test_wrapper
+@RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data={"max_followup_count": 2})
 def test_questioning_agent_single_question_no_followup():
     """Test asking a single question without followup"""
-    # Setup mock CLI
-    mock_cli = Mock()
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.return_value = "大學生學習程式設計"
-    RuntimeConfig.cli_interface = mock_cli
-    
-    # Setup mock config
-    RuntimeConfig.config_data = {"max_followup_count": 2}
     
-    # Setup mock LLM client (for followup check and compress)
-    mock_client = Mock()
     mock_client.invoke.side_effect = [
         # Followup check: not needed
         {"content": '{"need_followup": false}', "tokens_in": 50, "tokens_out": 20},
@@ -66,21 +73,15 @@ def test_questioning_agent_single_question_no_followup():
 
 
 @test_wrapper
+@RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data={"max_followup_count": 2})
 def test_questioning_agent_with_followup():
     """Test asking a question with one followup"""
-    # Setup mock CLI (will be called twice: original + followup)
-    mock_cli = Mock()
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.side_effect = [
         "不知道",  # Vague answer
         "B) 實作導向"  # Better answer after followup
     ]
-    RuntimeConfig.cli_interface = mock_cli
     
-    # Setup mock config
-    RuntimeConfig.config_data = {"max_followup_count": 2}
-    
-    # Setup mock LLM client
-    mock_client = Mock()
     mock_client.invoke.side_effect = [
         # First call: need followup with options
         {
@@ -136,18 +137,12 @@ def test_questioning_agent_with_followup():
 
 
 @test_wrapper
+@RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data={"max_followup_count": 1})
 def test_questioning_agent_max_followup_reached():
     """Test that followup stops at max limit"""
-    # Setup mock CLI
-    mock_cli = Mock()
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.side_effect = ["模糊", "A) 選項1"]
-    RuntimeConfig.cli_interface = mock_cli
-    
-    # Setup mock config with max_followup = 1
-    RuntimeConfig.config_data = {"max_followup_count": 1}
     
-    # Setup mock LLM client
-    mock_client = Mock()
     mock_client.invoke.side_effect = [
         # First followup check: needed
         {
@@ -189,18 +184,12 @@ def test_questioning_agent_max_followup_reached():
 
 
 @test_wrapper
+@RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data={"max_followup_count": 2})
 def test_questioning_agent_preserves_existing_answers():
     """Test that agent preserves answers from previous questions"""
-    # Setup mock CLI
-    mock_cli = Mock()
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.return_value = "新答案"
-    RuntimeConfig.cli_interface = mock_cli
-    
-    # Setup mock config
-    RuntimeConfig.config_data = {"max_followup_count": 2}
     
-    # Setup mock LLM client
-    mock_client = Mock()
     mock_client.invoke.side_effect = [
         # Followup check: not needed
         {"content": '{"need_followup": false}', "tokens_in": 40, "tokens_out": 15},
@@ -236,17 +225,10 @@ def test_questioning_agent_preserves_existing_answers():
 
 
 @test_wrapper
+@RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data={"max_followup_count": 2})
 def test_questioning_agent_error_on_invalid_dialogue_idx():
     """Test error handling when dialogue_idx is out of range"""
-    # Setup mock CLI
-    mock_cli = Mock()
-    RuntimeConfig.cli_interface = mock_cli
-    
-    # Setup mock config
-    RuntimeConfig.config_data = {"max_followup_count": 2}
-    
-    # Setup mock LLM client
-    mock_client = Mock()
+    mock_client, _ = _fresh_mocks()
     
     # Create and compile agent
     agent = QuestioningAgent(mock_client)
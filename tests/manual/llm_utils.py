@@ -0,0 +1,153 @@
+# tests/manual/llm_utils.py
+"""
+Shared LLM helpers for the manual test scripts.
+
+Provides one shared LLMClient per configuration, plus an on-disk response
+cache so re-running a script with the same prompts skips the LLM call
+entirely.
+
+Caching is only applied to deterministic requests (temperature <= 0)
+unless PROMPT_AGENT_CACHE=1 is set. Cache files live under
+PROMPT_AGENT_CACHE_DIR (default: ~/.cache/prompt_agent_tests).
+"""
+
+import os
+import json
+import hashlib
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from agentcore import LLMClient
+from openai import OpenAI
+
+DEFAULT_BASE_URL = "http://localhost:11434/v1"
+DEFAULT_API_KEY = ""
+DEFAULT_MODEL = "hf.co/unsloth/gemma-3n-E4B-it-GGUF:Q4_K_M"
+
+CACHE_DIR = Path(
+    os.environ.get("PROMPT_AGENT_CACHE_DIR", "~/.cache/prompt_agent_tests")
+).expanduser()
+
+
+class CachedLLMClient:
+    """
+    Drop-in wrapper around LLMClient that caches invoke() results on disk.
+
+    Agents only call `invoke`, so the wrapper can be passed anywhere an
+    LLMClient is expected.
+    """
+
+    def __init__(self, client, default_config: dict, cache_dir: Path = CACHE_DIR):
+        self.client = client
+        self.default_config = dict(default_config)
+        self.cache_dir = Path(cache_dir)
+        self.force = os.environ.get("PROMPT_AGENT_CACHE") == "1"
+
+    def _cacheable(self, config: dict) -> bool:
+        # Sampled replies differ run to run; only cache them on explicit opt-in
+        return self.force or config.get("temperature", 0) <= 0
+
+    @staticmethod
+    def _key(user_prompt: str, system_prompt: str, config: dict) -> str:
+        payload = {
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "config": config
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+    def invoke(self, user_prompt: str, system_prompt: str, config_override: dict = None) -> dict:
+        config = {**self.default_config, **(config_override or {})}
+        if not self._cacheable(config):
+            return self.client.invoke(
+                user_prompt=user_prompt,
+                system_prompt=system_prompt,
+                config_override=config_override
+            )
+
+        path = self.cache_dir / f"{self._key(user_prompt, system_prompt, config)}.json"
+        if path.is_file():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        response = self.client.invoke(
+            user_prompt=user_prompt,
+            system_prompt=system_prompt,
+            config_override=config_override
+        )
+
+        # Write to a temp file first so concurrent runs never read a partial entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(response, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        return response
+
+
+@lru_cache(maxsize=None)
+def get_llm_client(
+    base_url: str = DEFAULT_BASE_URL,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.7,
+    max_completion_tokens: int = 1000,
+    cached: bool = True
+):
+    """
+    Return the shared client for a configuration, creating it on first use.
+
+    Every caller asking for the same configuration gets the same client
+    (and its HTTP connection pool) for the life of the process.
+
+    Args:
+        base_url: OpenAI-compatible endpoint
+        model: Model name
+        temperature: Default sampling temperature
+        max_completion_tokens: Default completion budget
+        cached: Wrap the client in CachedLLMClient
+    """
+    llm_config = {
+        "model": model,
+        "temperature": temperature,
+        "max_completion_tokens": max_completion_tokens
+    }
+    client = LLMClient(
+        api_key=DEFAULT_API_KEY,
+        base_url=base_url,
+        default_config=llm_config
+    )
+    if cached:
+        return CachedLLMClient(client, llm_config)
+    return client
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(base_url: str = DEFAULT_BASE_URL) -> OpenAI:
+    """
+    Return a shared raw OpenAI client for calls LLMClient does not cover (e.g. streaming).
+
+    Uses the same endpoint and credentials as get_llm_client.
+    """
+    return OpenAI(api_key=DEFAULT_API_KEY, base_url=base_url)
+
+
+def warm_up(client) -> None:
+    """
+    Send a one-token request so the server loads the model before real calls.
+
+    Keeps model load time out of the first measured request. Bypasses the
+    response cache, which would otherwise answer without touching the server.
+    Failures are reported but not raised; the real call will surface them.
+    """
+    raw_client = client.client if isinstance(client, CachedLLMClient) else client
+    try:
+        raw_client.invoke(
+            user_prompt=".",
+            system_prompt="",
+            config_override={"max_completion_tokens": 1}
+        )
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
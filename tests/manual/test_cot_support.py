@@ -6,22 +6,56 @@ This script tests:
 1. Basic reasoning without CoT prompt
 2. Reasoning with explicit CoT prompt
 3. OpenAI-style reasoning_effort parameter (if supported)
+
+Set PROMPT_AGENT_COT_STYLE=concise to A/B the explicit step-by-step
+instructions against terse ones (default: verbose).
 """
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from agentcore import LLMClient
+from llm_utils import DEFAULT_MODEL, get_llm_client, warm_up
+
+# PROMPT_AGENT_COT_STYLE=verbose|concise picks the CoT instructions for tests 2 and 4
+COT_STYLE = os.environ.get("PROMPT_AGENT_COT_STYLE", "verbose")
+
+COT_SCAFFOLDS = {
+    "explicit": {
+        "verbose": """請按照以下步驟思考：
+1. 首先，列出初始狀態
+2. 然後，計算每一步的變化
+3. 最後，給出最終答案
+
+讓我們一步一步地思考。""",
+        "concise": "分步思考。"
+    },
+    "complex": {
+        "verbose": """請按照以下步驟思考：
+1. 列出所有可能的名次組合
+2. 對每種組合，檢查是否符合「只有一人說謊」的條件
+3. 找出唯一符合的組合
+
+讓我們一步一步地分析。""",
+        "concise": "詳細分步分析。"
+    }
+}
+
+
+def cot_scaffold(name: str) -> str:
+    """Return the CoT instructions for a test in the selected style."""
+    styles = COT_SCAFFOLDS[name]
+    if COT_STYLE not in styles:
+        raise ValueError(f"PROMPT_AGENT_COT_STYLE must be one of: {', '.join(styles)}")
+    return styles[COT_STYLE]
 
 
 def test_basic_reasoning(client):
     """Test basic reasoning without CoT."""
-    print("\n" + "=" * 80)
-    print("測試 1: 基本推理（無 CoT 提示）")
-    print("=" * 80)
+    lines = ["", "=" * 80, "測試 1: 基本推理（無 CoT 提示）", "=" * 80]
     
     user_prompt = """
 問題：小明有 15 顆蘋果，他給了小華 3 顆，然後又買了 8 顆。小明現在有多少顆蘋果？
@@ -34,31 +68,26 @@ def test_basic_reasoning(client):
         response = client.invoke(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
-            config_override={}
+            config_override={"max_completion_tokens": 32}
         )
         
-        print(f"\n回答: {response['content']}")
-        print(f"Tokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
+        lines.append(f"\n回答: {response['content']}")
+        lines.append(f"Tokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
         
     except Exception as e:
-        print(f"錯誤: {e}")
+        lines.append(f"錯誤: {e}")
+    
+    return "\n".join(lines)
 
 
 def test_explicit_cot(client):
     """Test reasoning with explicit CoT prompt."""
-    print("\n" + "=" * 80)
-    print("測試 2: 明確的 CoT 提示（Let's think step by step）")
-    print("=" * 80)
+    lines = ["", "=" * 80, "測試 2: 明確的 CoT 提示（Let's think step by step）", "=" * 80]
     
-    user_prompt = """
+    user_prompt = f"""
 問題：小明有 15 顆蘋果，他給了小華 3 顆，然後又買了 8 顆。小明現在有多少顆蘋果？
 
-請按照以下步驟思考：
-1. 首先，列出初始狀態
-2. 然後，計算每一步的變化
-3. 最後，給出最終答案
-
-讓我們一步一步地思考。
+{cot_scaffold("explicit")}
 """
     
     system_prompt = "你是一個數學助手，擅長逐步推理。"
@@ -67,21 +96,21 @@ def test_explicit_cot(client):
         response = client.invoke(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
-            config_override={}
+            config_override={"max_completion_tokens": 512}
         )
         
-        print(f"\n回答:\n{response['content']}")
-        print(f"\nTokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
+        lines.append(f"\n回答:\n{response['content']}")
+        lines.append(f"\nTokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
         
     except Exception as e:
-        print(f"錯誤: {e}")
+        lines.append(f"錯誤: {e}")
+    
+    return "\n".join(lines)
 
 
 def test_reasoning_effort_parameter(client):
     """Test OpenAI-style reasoning_effort parameter."""
-    print("\n" + "=" * 80)
-    print("測試 3: reasoning_effort 參數（OpenAI o1 風格）")
-    print("=" * 80)
+    lines = ["", "=" * 80, "測試 3: reasoning_effort 參數（OpenAI o1 風格）", "=" * 80]
     
     user_prompt = """
 問題：小明有 15 顆蘋果，他給了小華 3 顆，然後又買了 8 顆。小明現在有多少顆蘋果？
@@ -89,32 +118,43 @@ def test_reasoning_effort_parameter(client):
     
     system_prompt = "你是一個數學助手。"
     
-    for effort in ["low", "medium", "high"]:
-        print(f"\n--- Reasoning Effort: {effort} ---")
+    efforts = ["low", "medium", "high"]
+    
+    def ask(effort):
+        # Same prompt strings every time; only reasoning_effort differs
+        return client.invoke(
+            user_prompt=user_prompt,
+            system_prompt=system_prompt,
+            config_override={
+                "reasoning_effort": effort,
+                "max_completion_tokens": 256
+            }
+        )
+    
+    # Submit all efforts at once so the server can share the prompt prefix
+    with ThreadPoolExecutor(max_workers=len(efforts)) as executor:
+        futures = [executor.submit(ask, effort) for effort in efforts]
+    
+    for effort, future in zip(efforts, futures):
+        lines.append(f"\n--- Reasoning Effort: {effort} ---")
         
         try:
-            response = client.invoke(
-                user_prompt=user_prompt,
-                system_prompt=system_prompt,
-                config_override={
-                    "reasoning_effort": effort
-                }
-            )
+            response = future.result()
             
-            print(f"回答: {response['content'][:200]}...")
-            print(f"Tokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
+            lines.append(f"回答: {response['content'][:200]}...")
+            lines.append(f"Tokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
             
         except Exception as e:
-            print(f"不支援 reasoning_effort='{effort}': {e}")
+            lines.append(f"不支援 reasoning_effort='{effort}': {e}")
+    
+    return "\n".join(lines)
 
 
 def test_complex_reasoning(client):
     """Test complex reasoning problem."""
-    print("\n" + "=" * 80)
-    print("測試 4: 複雜推理問題（含 CoT）")
-    print("=" * 80)
+    lines = ["", "=" * 80, "測試 4: 複雜推理問題（含 CoT）", "=" * 80]
     
-    user_prompt = """
+    user_prompt = f"""
 問題：
 有三個人 A、B、C 參加比賽。
 - A 說：「我不是第一名」
@@ -123,12 +163,7 @@ def test_complex_reasoning(client):
 
 已知其中只有一個人說謊，請推理出正確的名次。
 
-請按照以下步驟思考：
-1. 列出所有可能的名次組合
-2. 對每種組合，檢查是否符合「只有一人說謊」的條件
-3. 找出唯一符合的組合
-
-讓我們一步一步地分析。
+{cot_scaffold("complex")}
 """
     
     system_prompt = "你是一個邏輯推理專家，擅長逐步分析問題。"
@@ -137,14 +172,16 @@ def test_complex_reasoning(client):
         response = client.invoke(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
-            config_override={}
+            config_override={"max_completion_tokens": 1024}
         )
         
-        print(f"\n回答:\n{response['content']}")
-        print(f"\nTokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
+        lines.append(f"\n回答:\n{response['content']}")
+        lines.append(f"\nTokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
         
     except Exception as e:
-        print(f"錯誤: {e}")
+        lines.append(f"錯誤: {e}")
+    
+    return "\n".join(lines)
 
 
 def main():
@@ -154,24 +191,24 @@ def main():
     
     # Setup LLM client
     print("\n連接到 Ollama...")
-    client = LLMClient(
-        api_key="",
-        base_url="http://localhost:11434/v1",
-        default_config={
-            "model": "hf.co/unsloth/gemma-3n-E4B-it-GGUF:Q4_K_M",
-            "temperature": 0.7,
-            "max_completion_tokens": 1000
-        }
-    )
-    
-    print(f"模型: hf.co/unsloth/gemma-3n-E4B-it-GGUF:Q4_K_M")
-    
-    # Run tests
+    client = get_llm_client()
+    warm_up(client)
+    
+    print(f"模型: {DEFAULT_MODEL}")
+    
+    tests = [
+        test_basic_reasoning,
+        test_explicit_cot,
+        test_reasoning_effort_parameter,
+        test_complex_reasoning
+    ]
+    
+    # Run tests concurrently (independent requests), print reports in order
     try:
-        test_basic_reasoning(client)
-        test_explicit_cot(client)
-        test_reasoning_effort_parameter(client)
-        test_complex_reasoning(client)
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(test, client) for test in tests]
+            for future in futures:
+                print(future.result())
         
         print("\n" + "=" * 80)
         print(" 測試完成")
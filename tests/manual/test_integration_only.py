@@ -4,33 +4,45 @@ Manual integration-only test driven by a JSON config file.
 
 Usage:
     python tests/manual/test_integration_only.py --config config/json_config/integration_test_config.json
+
+The config may give "stage_idxs": [1, 2, ...] instead of "stage_idx" to run
+several stages concurrently against the same client; each stage's result is
+written to output_path with a _stage<N> suffix.
 """
 
 import argparse
-import json
+import orjson
 import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from agentcore import LLMClient
 from agents.integration_agent import IntegrationAgent
 from config.config_loader import load_config
 from config.runtime_config import RuntimeConfig
+from llm_utils import get_llm_client, warm_up
 
 
 def load_input_config(path: str) -> dict:
-    with open(path, "r", encoding="utf-8") as handle:
-        return json.load(handle)
+    with open(path, "rb") as handle:
+        return orjson.loads(handle.read())
 
 
 def validate_input_config(data: dict) -> None:
-    required_fields = ["stage_idx", "current_prompt", "answer_list"]
+    required_fields = ["current_prompt", "answer_list"]
     for field in required_fields:
         if field not in data:
             raise ValueError(f"Missing required field: {field}")
 
-    if not isinstance(data["stage_idx"], int):
+    if "stage_idxs" in data:
+        stage_idxs = data["stage_idxs"]
+        if not isinstance(stage_idxs, list) or not stage_idxs:
+            raise ValueError("stage_idxs must be a non-empty list of integers")
+        if not all(isinstance(item, int) for item in stage_idxs):
+            raise ValueError("stage_idxs must be a non-empty list of integers")
+    elif "stage_idx" not in data:
+        raise ValueError("Missing required field: stage_idx")
+    elif not isinstance(data["stage_idx"], int):
         raise ValueError("stage_idx must be an integer")
     if not isinstance(data["current_prompt"], str):
         raise ValueError("current_prompt must be a string")
@@ -71,6 +83,19 @@ def resolve_current_prompt(prompt_value: str, config_root: str) -> str:
     return prompt_value
 
 
+def get_stage_idxs(data: dict) -> list:
+    if "stage_idxs" in data:
+        return data["stage_idxs"]
+    return [data["stage_idx"]]
+
+
+def stage_output_path(path: str, stage_idx: int) -> str:
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_stage{stage_idx}{ext}"
+
+
 def write_output(path: str, content: str) -> None:
     if not path:
         return
@@ -98,39 +123,44 @@ def main() -> None:
     config = load_config("config/json_config/config.json")
     RuntimeConfig.config_data = config
 
-    system_prompt = resolve_integration_prompt(input_config["stage_idx"], config)
+    stage_idxs = get_stage_idxs(input_config)
+    system_prompts = [resolve_integration_prompt(idx, config) for idx in stage_idxs]
 
-    print("\n=== System Prompt ===")
-    print(system_prompt)
+    for stage_idx, system_prompt in zip(stage_idxs, system_prompts):
+        print(f"\n=== System Prompt (stage {stage_idx}) ===")
+        print(system_prompt)
 
-    llm_config = {
-        "model": "hf.co/unsloth/gemma-3n-E4B-it-GGUF:Q4_K_M",
-        "temperature": 0.7,
-        "max_completion_tokens": 1000,
-    }
-    llm_client = LLMClient(
-        api_key="",
-        base_url="http://localhost:11434/v1",
-        default_config=llm_config,
-    )
+    llm_client = get_llm_client()
+    warm_up(llm_client)
 
     agent = IntegrationAgent(llm_client)
     compiled = agent.compile()
     current_prompt = resolve_current_prompt(input_config["current_prompt"], config_root)
 
-    state = {
-        "system_prompt": system_prompt,
-        "current_prompt": current_prompt,
-        "answer_list": input_config["answer_list"],
-    }
-
-    result = compiled.invoke(state)
-    current_prompt = result.get("current_prompt", "")
-
-    print("\n=== Integration Result ===")
-    print(current_prompt)
-
-    write_output(input_config.get("output_path", ""), current_prompt)
+    states = [
+        {
+            "system_prompt": system_prompt,
+            "current_prompt": current_prompt,
+            "answer_list": input_config["answer_list"],
+        }
+        for system_prompt in system_prompts
+    ]
+
+    # Stages are independent; batch() runs them concurrently on one graph
+    results = compiled.batch(states, config={"max_concurrency": len(states)})
+
+    output_path = input_config.get("output_path", "")
+    multi_stage = "stage_idxs" in input_config
+    for stage_idx, result in zip(stage_idxs, results):
+        improved_prompt = result.get("current_prompt", "")
+
+        print(f"\n=== Integration Result (stage {stage_idx}) ===")
+        print(improved_prompt)
+
+        write_output(
+            stage_output_path(output_path, stage_idx) if multi_stage else output_path,
+            improved_prompt
+        )
 
 
 if __name__ == "__main__":
@@ -2,45 +2,90 @@
 # tests/manual/test_llm_connection.py
 """
 Simple test to verify Ollama connection.
+
+Usage:
+    python tests/manual/test_llm_connection.py              # stream tokens as they arrive
+    python tests/manual/test_llm_connection.py --no-stream  # blocking call via LLMClient
 """
 
 import sys
 import os
+import argparse
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from agentcore import LLMClient
+from llm_utils import DEFAULT_MODEL, get_llm_client, get_openai_client
+
+DEFAULT_CONFIG = {
+    "model": DEFAULT_MODEL,
+    "temperature": 0.7,
+    "max_completion_tokens": 32
+}
+
+
+def stream_reply(user_prompt: str, system_prompt: str) -> dict:
+    """Stream a chat completion to stdout and return it in LLMClient.invoke's shape."""
+    client = get_openai_client()
+    stream = client.chat.completions.create(
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        stream=True,
+        stream_options={"include_usage": True},
+        **DEFAULT_CONFIG
+    )
+
+    parts = []
+    tokens_in = tokens_out = 0
+    for chunk in stream:
+        if chunk.choices:
+            text = chunk.choices[0].delta.content or ""
+            if text:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                parts.append(text)
+        if chunk.usage is not None:
+            tokens_in = chunk.usage.prompt_tokens
+            tokens_out = chunk.usage.completion_tokens
+    print()
+
+    return {"content": "".join(parts), "tokens_in": tokens_in, "tokens_out": tokens_out}
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Verify the Ollama connection")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="Wait for the full reply through LLMClient instead of streaming")
+    args = parser.parse_args()
+
     print("Testing Ollama connection...\n")
-    
-    # Setup LLM client
-    client = LLMClient(
-        api_key="",
-        base_url="http://localhost:11434/v1",
-        default_config={
-            "model": "hf.co/unsloth/gemma-3n-E4B-it-GGUF:Q4_K_M",
-            "temperature": 0.7,
-            "max_completion_tokens": 100
-        }
-    )
-    
+
     # Simple test
     print("Sending: 'Hello, how are you?'\n")
-    
+
     try:
-        response = client.invoke(
-            user_prompt="Hello, how are you?",
-            system_prompt="You are a helpful assistant.",
-            config_override={}
-        )
-        
-        print("Response:")
-        print(response["content"])
+        if args.no_stream:
+            # Uncached: this script checks the live connection
+            client = get_llm_client(**DEFAULT_CONFIG, cached=False)
+            response = client.invoke(
+                user_prompt="Hello, how are you?",
+                system_prompt="You are a helpful assistant.",
+                config_override={}
+            )
+
+            print("Response:")
+            print(response["content"])
+        else:
+            print("Response:")
+            response = stream_reply(
+                user_prompt="Hello, how are you?",
+                system_prompt="You are a helpful assistant."
+            )
+
         print(f"\nTokens - In: {response['tokens_in']}, Out: {response['tokens_out']}")
-        
+
     except Exception as e:
         print(f"Error: {e}")
         import traceback
@@ -48,4 +93,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,17 +5,18 @@ Interactive script for testing individual stages and agents.
 Usage:
     python tests/manual/test_stage.py --stage 1
     python tests/manual/test_stage.py --stage 3
+    python tests/manual/test_stage.py --stage 3 --use-cached-diagnostic
 """
 
 import sys
 import os
-import json
+import orjson
 import argparse
+from functools import lru_cache
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from agentcore import LLMClient
 from agents.diagnostic_agent import DiagnosticAgent
 from agents.questioning_agent import QuestioningAgent
 from agents.integration_agent import IntegrationAgent
@@ -23,6 +24,7 @@ from agents.orchestrator.tool import OrchestratorTool
 from config.runtime_config import RuntimeConfig
 from config.config_loader import load_config
 from cli.cli_interface import CLIInterface
+from llm_utils import get_llm_client, warm_up
 
 
 def get_config_root(config_path: str) -> str:
@@ -48,11 +50,12 @@ def resolve_prompt_value(prompt_value: str, config_root: str) -> str:
     return prompt_value
 
 
+@lru_cache(maxsize=None)
 def load_test_config():
-    """Load test configuration."""
+    """Load test configuration (read once per process)."""
     config_path = "config/json_config/test_config.json"
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(config_path, 'rb') as f:
+        data = orjson.loads(f.read())
     data["test_prompt"] = resolve_prompt_value(
         data.get("test_prompt", ""),
         get_config_root(config_path)
@@ -60,6 +63,54 @@ def load_test_config():
     return data
 
 
+@lru_cache(maxsize=None)
+def get_orchestrator_tool():
+    """Return a single OrchestratorTool so config.json is parsed once."""
+    return OrchestratorTool()
+
+
+@lru_cache(maxsize=None)
+def get_stage_prompt(stage_idx: int, agent_type: str) -> str:
+    """
+    Return the system prompt for a stage/agent pair.
+
+    Cached so every run and every question turn sends the byte-identical
+    string, letting the LLM server reuse its prefix cache.
+    """
+    return get_orchestrator_tool().get_system_prompt(stage_idx, agent_type)
+
+
+# Compiled agent graphs keyed by (agent class, id(llm_client))
+_COMPILED = {}
+
+
+def get_compiled(agent_cls, llm_client):
+    """Compile each agent graph once per LLM client and reuse it."""
+    key = (agent_cls, id(llm_client))
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = _COMPILED[key] = agent_cls(llm_client).compile()
+    return compiled
+
+
+def _print_list(key, value):
+    lines = [f"{key}:"]
+    lines.extend(f"  {i}. {item}" for i, item in enumerate(value, 1))
+    print("\n".join(lines))
+
+
+def _print_str(key, value):
+    print(f"{key}: {value[:100]}..." if len(value) > 100 else f"{key}: {value}")
+
+
+def _print_value(key, value):
+    print(f"{key}: {value}")
+
+
+# print_state formatters by exact value type
+_STATE_PRINTERS = {list: _print_list, str: _print_str}
+
+
 def print_state(state, title="State"):
     """Pretty print state dictionary."""
     print()
@@ -67,14 +118,7 @@ def print_state(state, title="State"):
     print(f" {title}")
     print("=" * 80)
     for key, value in state.items():
-        if isinstance(value, list):
-            print(f"{key}:")
-            for i, item in enumerate(value, 1):
-                print(f"  {i}. {item}")
-        elif isinstance(value, str) and len(value) > 100:
-            print(f"{key}: {value[:100]}...")
-        else:
-            print(f"{key}: {value}")
+        _STATE_PRINTERS.get(type(value), _print_value)(key, value)
     print("=" * 80)
     print()
 
@@ -94,12 +138,9 @@ def run_diagnostic(llm_client, stage_idx, test_prompt):
     """Run DiagnosticAgent and return state."""
     print("\n[自動執行] DiagnosticAgent - 生成問題...")
     
-    # Use OrchestratorTool to get prompt
-    orch_tool = OrchestratorTool()
-    system_prompt = orch_tool.get_system_prompt(stage_idx, "diagnostic")
+    system_prompt = get_stage_prompt(stage_idx, "diagnostic")
     
-    agent = DiagnosticAgent(llm_client)
-    compiled = agent.compile()
+    compiled = get_compiled(DiagnosticAgent, llm_client)
     
     state = {
         "system_prompt": system_prompt,
@@ -116,17 +157,54 @@ def run_diagnostic(llm_client, stage_idx, test_prompt):
     return result
 
 
+def diagnostic_snapshot_path(stage_idx: int, output_dir: str = "outputs") -> str:
+    return os.path.join(output_dir, f"diagnostic_{stage_idx}.json")
+
+
+def load_or_run_diagnostic(llm_client, stage_idx, test_prompt, use_cached=False):
+    """
+    Return DiagnosticAgent output, reusing the saved snapshot when allowed.
+
+    Every fresh run is snapshotted to outputs/diagnostic_<stage>.json. With
+    use_cached, a snapshot made from the same test prompt and diagnostic
+    system prompt is reused instead of calling the LLM again.
+    """
+    path = diagnostic_snapshot_path(stage_idx)
+    system_prompt = get_stage_prompt(stage_idx, "diagnostic")
+
+    if use_cached and os.path.isfile(path):
+        with open(path, "rb") as f:
+            snapshot = orjson.loads(f.read())
+        if snapshot.get("test_prompt") == test_prompt and snapshot.get("system_prompt") == system_prompt:
+            print(f"\n[快取] 使用已儲存的診斷結果: {path}")
+            print_state(snapshot, "DiagnosticAgent 快取 State")
+            return snapshot
+        print(f"\n[快取] {path} 已過期，重新執行診斷")
+
+    result = run_diagnostic(llm_client, stage_idx, test_prompt)
+
+    snapshot = {
+        "test_prompt": test_prompt,
+        "system_prompt": system_prompt,
+        "current_prompt": result["current_prompt"],
+        "question_list": result["question_list"]
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+
+    return result
+
+
 def run_questioning(llm_client, stage_idx, current_prompt, question_list):
     """Run QuestioningAgent and return state."""
     print("\n[執行] QuestioningAgent - CLI 互動...")
     
-    # Use OrchestratorTool to get prompts
-    orch_tool = OrchestratorTool()
-    system_prompt_followup = orch_tool.get_system_prompt(stage_idx, "questioning_followup")
-    system_prompt_compress = orch_tool.get_system_prompt(stage_idx, "questioning_compress")
+    # Resolved once; every question turn reuses the same prompt strings
+    system_prompt_followup = get_stage_prompt(stage_idx, "questioning_followup")
+    system_prompt_compress = get_stage_prompt(stage_idx, "questioning_compress")
     
-    agent = QuestioningAgent(llm_client)
-    compiled = agent.compile()
+    compiled = get_compiled(QuestioningAgent, llm_client)
     
     state = {
         "system_prompt_followup": system_prompt_followup,
@@ -160,12 +238,9 @@ def run_integration(llm_client, stage_idx, current_prompt, answer_list):
     """Run IntegrationAgent and return state."""
     print("\n[執行] IntegrationAgent - 整合答案...")
     
-    # Use OrchestratorTool to get prompt
-    orch_tool = OrchestratorTool()
-    system_prompt = orch_tool.get_system_prompt(stage_idx, "integration")
+    system_prompt = get_stage_prompt(stage_idx, "integration")
     
-    agent = IntegrationAgent(llm_client)
-    compiled = agent.compile()
+    compiled = get_compiled(IntegrationAgent, llm_client)
     
     state = {
         "system_prompt": system_prompt,
@@ -186,6 +261,8 @@ def main():
     parser = argparse.ArgumentParser(description='Interactive stage testing script')
     parser.add_argument('--stage', type=int, required=True, 
                        help='Stage number (1-6)')
+    parser.add_argument('--use-cached-diagnostic', action='store_true',
+                       help='Reuse outputs/diagnostic_<stage>.json for choices 2 and 3 instead of re-running DiagnosticAgent')
     args = parser.parse_args()
     
     stage_idx = args.stage
@@ -210,17 +287,8 @@ def main():
     # Setup LLM client
     print("\n連接 LLM...")
     
-    llm_config = {
-        "model": "hf.co/unsloth/gemma-3n-E4B-it-GGUF:Q4_K_M",
-        "temperature": 0.7,
-        "max_completion_tokens": 1000
-    }
-    
-    llm_client = LLMClient(
-        api_key="",
-        base_url="http://localhost:11434/v1",
-        default_config=llm_config
-    )
+    llm_client = get_llm_client()
+    warm_up(llm_client)
     
     # Interactive menu
     print("\n請選擇要測試的 Agent:")
@@ -239,7 +307,8 @@ def main():
             
         elif choice == "2":
             # Test Questioning (auto-run Diagnostic first)
-            diagnostic_result = run_diagnostic(llm_client, stage_idx, test_prompt)
+            diagnostic_result = load_or_run_diagnostic(llm_client, stage_idx, test_prompt,
+                                                       args.use_cached_diagnostic)
             question_list = diagnostic_result["question_list"]
             current_prompt = diagnostic_result["current_prompt"]
             
@@ -248,7 +317,8 @@ def main():
             
         elif choice == "3":
             # Test Integration (auto-run Diagnostic + Questioning first)
-            diagnostic_result = run_diagnostic(llm_client, stage_idx, test_prompt)
+            diagnostic_result = load_or_run_diagnostic(llm_client, stage_idx, test_prompt,
+                                                       args.use_cached_diagnostic)
             question_list = diagnostic_result["question_list"]
             current_prompt = diagnostic_result["current_prompt"]
             
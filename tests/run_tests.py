@@ -0,0 +1,95 @@
+# tests/run_tests.py
+"""
+Run the automated test modules in parallel.
+
+Each module runs its own __main__ block in a separate interpreter, so
+modules never share RuntimeConfig or mock state. Output is printed per
+module in a stable order once all modules finish.
+
+test_wrapper (agentcore) reports a failing test by printing a line that
+starts with a FAIL marker, optionally after a status symbol, rather than
+raising. A module therefore counts as failed if it exits non-zero or prints
+any such line; FAIL elsewhere in a line (or FAILED, FAILURE) is not counted.
+
+Usage:
+    python tests/run_tests.py                  # unit, integration and system
+    python tests/run_tests.py unit integration
+    python tests/run_tests.py -j 4
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SUITES = ("unit", "integration", "system")
+
+# One match per failing test: the FAIL marker at the start of a line
+_FAIL_RE = re.compile(r"^\s*\S*\s*FAIL\b", re.MULTILINE)
+
+
+def discover(suites):
+    """Return dotted module names for every test_*.py file in the given suites."""
+    modules = []
+    for suite in suites:
+        for path in sorted((ROOT / "tests" / suite).glob("test_*.py")):
+            modules.append(f"tests.{suite}.{path.stem}")
+    return modules
+
+
+def run_module(module: str) -> subprocess.CompletedProcess:
+    """Run one test module as `python -m <module>` from the repo root."""
+    return subprocess.run(
+        [sys.executable, "-m", module],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run test modules in parallel")
+    parser.add_argument("suites", nargs="*", metavar="suite",
+                        help=f"Test suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of modules to run at once (default: CPU count)")
+    args = parser.parse_args()
+    # Checked by hand: argparse rejects an empty nargs="*" list against choices
+    unknown = [suite for suite in args.suites if suite not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)} (choose from {', '.join(SUITES)})")
+
+    modules = discover(args.suites or list(SUITES))
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        results = list(executor.map(run_module, modules))
+
+    failed = []
+    failed_tests = 0
+    for module, result in zip(modules, results):
+        print("=" * 80)
+        print(f" {module}")
+        print("=" * 80)
+        print(result.stdout, end="")
+        if result.stderr:
+            print(result.stderr, end="", file=sys.stderr)
+        test_failures = len(_FAIL_RE.findall(result.stdout))
+        failed_tests += test_failures
+        if result.returncode != 0 or test_failures:
+            failed.append(module)
+
+    print()
+    print(f"{len(modules) - len(failed)}/{len(modules)} modules passed, "
+          f"{failed_tests} failing test(s) reported")
+    for module in failed:
+        print(f"  FAILED: {module}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,93 +1,198 @@
 # tests/system/test_orchestrator_system.py
 """System test for Orchestrator full flow across all stages."""
 
-import json
+import os
 import re
+import statistics
+import time
+from functools import lru_cache, wraps
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import MappingProxyType
+from unittest.mock import DEFAULT, Mock, patch
 
-from agentcore import test_wrapper
+import orjson
+from agentcore import LLMClient, test_wrapper
 from agents.orchestrator import Orchestrator
+from cli.cli_interface import CLIInterface
 from config.runtime_config import RuntimeConfig
 
 CONFIG_PATH = Path("config/json_config/system_test_config.json")
 
+_PROMPT_RE = re.compile(r"```\s*(.*?)\s*```", re.DOTALL)
+_STAGE_RE = re.compile(r"STAGE_(\d+)")
+_AGENT_TAG_RE = re.compile(r"SYSTEM_TEST_(DIAGNOSTIC|FOLLOWUP|COMPRESS|INTEGRATION)")
 
+# Canned replies that never vary between calls; returned as-is, never mutated
+_NO_QUESTIONS_RESP = MappingProxyType({"content": '{"questions": []}'})
+_ONE_QUESTION_RESP = MappingProxyType({"content": '{"questions": ["Test question?"]}'})
+_FOLLOWUP_RESP = MappingProxyType({"content": '{"need_followup": false}'})
+_COMPRESS_RESP = MappingProxyType({"content": '{"compressed": "Q: test? A: answer"}'})
+
+# Median wall time allowed for one mocked 6-stage run. Wall-clock timing
+# depends on machine load, so the budget is only checked when
+# PROMPT_AGENT_FLOW_BUDGET_MS is set (e.g. 250 on a quiet machine)
+_FLOW_BUDGET_MS = os.environ.get("PROMPT_AGENT_FLOW_BUDGET_MS")
+_FLOW_BUDGET_S = float(_FLOW_BUDGET_MS) / 1000 if _FLOW_BUDGET_MS else None
+_FLOW_RUNS = 5
+
+# Shared across runs and reset by _fresh_mocks()
+_MOCK_CLIENT = Mock(spec=LLMClient)
+_MOCK_CLI = Mock(spec=CLIInterface)
+
+
+def _fresh_mocks() -> tuple[Mock, Mock]:
+    """Reset and return the shared LLM client and CLI mocks."""
+    for mock in (_MOCK_CLIENT, _MOCK_CLI):
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _MOCK_CLIENT, _MOCK_CLI
+
+
+@lru_cache(maxsize=1)
 def load_system_test_config():
-    """Load system test config from config/json_config/system_test_config.json."""
-    with CONFIG_PATH.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    """Load system test config from config/json_config/system_test_config.json (read once)."""
+    return orjson.loads(CONFIG_PATH.read_bytes())
 
 
+@lru_cache(maxsize=64)
 def extract_prompt(user_prompt: str) -> str:
-    """Extract prompt text from the first fenced block in user_prompt."""
-    match = re.search(r"```\s*(.*?)\s*```", user_prompt, re.DOTALL)
+    """Extract prompt text from the first fenced block in user_prompt (memoized)."""
+    match = _PROMPT_RE.search(user_prompt)
     if not match:
         raise AssertionError("prompt block not found in user_prompt")
     return match.group(1).strip()
 
 
+@lru_cache(maxsize=32)
 def extract_stage_tag(system_prompt: str) -> str:
-    """Extract stage tag like stage_1 from system_prompt."""
-    match = re.search(r"STAGE_(\d+)", system_prompt)
+    """Extract stage tag like stage_1 from system_prompt (memoized)."""
+    match = _STAGE_RE.search(system_prompt)
     if not match:
         return "stage_unknown"
     return f"stage_{match.group(1)}"
 
 
-@test_wrapper
-def test_orchestrator_full_flow_system():
-    """Run full 6-stage flow and verify cross-stage propagation."""
-    config = load_system_test_config()
-    RuntimeConfig.config_data = config
+def _runtime(test):
+    """
+    Install the system test config and the shared CLI mock for the decorated test only.
+
+    The config is loaded when the test runs, so a missing config file is
+    reported as that test's failure instead of breaking the module import.
+    """
+    @wraps(test)
+    def wrapper(*args, **kwargs):
+        with RuntimeConfig.override(cli_interface=_MOCK_CLI, config_data=load_system_test_config()):
+            return test(*args, **kwargs)
+    return wrapper
 
-    mock_cli = Mock()
+
+def _prepare_mocks() -> tuple[Mock, Mock]:
+    """Reset the shared mocks and script the CLI answers."""
+    mock_client, mock_cli = _fresh_mocks()
     mock_cli.get_user_input.return_value = "system test answer"
     mock_cli.update_stage.return_value = None
     mock_cli.show_waiting_message.return_value = None
     mock_cli.clear_conversation.return_value = None
-    RuntimeConfig.cli_interface = mock_cli
+    return mock_client, mock_cli
 
-    diagnostic_prompts = []
-    integration_prompts = []
+
+def _make_invoke(diagnostic_prompts: list, integration_prompts: list):
+    """Build a fake LLMClient.invoke that answers by agent tag and records prompts."""
+
+    def on_diagnostic(user_prompt, system_prompt):
+        current_prompt = extract_prompt(user_prompt)
+        diagnostic_prompts.append((system_prompt, current_prompt))
+        if "STAGE_2" in system_prompt:
+            return _NO_QUESTIONS_RESP
+        return _ONE_QUESTION_RESP
+
+    def on_followup(user_prompt, system_prompt):
+        return _FOLLOWUP_RESP
+
+    def on_compress(user_prompt, system_prompt):
+        return _COMPRESS_RESP
+
+    def on_integration(user_prompt, system_prompt):
+        current_prompt = extract_prompt(user_prompt)
+        stage_tag = extract_stage_tag(system_prompt)
+        integration_prompts.append((system_prompt, current_prompt))
+        return {
+            "content": orjson.dumps({
+                "current_prompt": f"{current_prompt} | integrated:{stage_tag}"
+            }).decode()
+        }
+
+    # One scan of the system prompt picks the handler for the calling agent
+    handlers = {
+        "DIAGNOSTIC": on_diagnostic,
+        "FOLLOWUP": on_followup,
+        "COMPRESS": on_compress,
+        "INTEGRATION": on_integration,
+    }
 
     def mock_invoke(*args, **kwargs):
         user_prompt = kwargs.get("user_prompt", "")
         system_prompt = kwargs.get("system_prompt", "")
 
-        if "SYSTEM_TEST_DIAGNOSTIC" in system_prompt:
-            current_prompt = extract_prompt(user_prompt)
-            diagnostic_prompts.append((system_prompt, current_prompt))
-            if "STAGE_2" in system_prompt:
-                return {"content": "{\"questions\": []}"}
-            return {"content": "{\"questions\": [\"Test question?\"]}"}
+        match = _AGENT_TAG_RE.search(system_prompt)
+        if not match:
+            raise AssertionError(f"Unexpected system_prompt: {system_prompt}")
+        return handlers[match.group(1)](user_prompt, system_prompt)
+
+    return mock_invoke
+
+
+def _cached_invoke(invoke, maxsize: int = 64):
+    """
+    Wrap an invoke callable in an in-process cache keyed on (system_prompt, user_prompt).
+
+    Stands in for a prompt cache in front of the LLM; cache_info() is
+    exposed so tests can check the hit rate.
+    """
+
+    @lru_cache(maxsize=maxsize)
+    def cached(system_prompt: str, user_prompt: str):
+        return invoke(user_prompt=user_prompt, system_prompt=system_prompt)
+
+    def wrapper(*args, **kwargs):
+        return cached(kwargs.get("system_prompt", ""), kwargs.get("user_prompt", ""))
+
+    wrapper.cache_info = cached.cache_info
+    return wrapper
 
-        if "SYSTEM_TEST_FOLLOWUP" in system_prompt:
-            return {"content": "{\"need_followup\": false}"}
 
-        if "SYSTEM_TEST_COMPRESS" in system_prompt:
-            return {"content": "{\"compressed\": \"Q: test? A: answer\"}"}
+@lru_cache(maxsize=8)
+def _compiled_orchestrator(initial_prompt: str):
+    """
+    Build and compile the Orchestrator over the shared mock client once per prompt.
 
-        if "SYSTEM_TEST_INTEGRATION" in system_prompt:
-            current_prompt = extract_prompt(user_prompt)
-            stage_tag = extract_stage_tag(system_prompt)
-            integration_prompts.append((system_prompt, current_prompt))
-            return {
-                "content": json.dumps({
-                    "current_prompt": f"{current_prompt} | integrated:{stage_tag}"
-                })
-            }
+    The graph only holds a reference to _MOCK_CLIENT, so later runs pick
+    up whatever invoke side_effect the test installs.
+    """
+    with patch.multiple(
+        "agents.orchestrator.tool",
+        load_config=Mock(return_value=load_system_test_config()),
+        validate_config=DEFAULT
+    ):
+        return Orchestrator(_MOCK_CLIENT, initial_prompt).compile()
 
-        raise AssertionError(f"Unexpected system_prompt: {system_prompt}")
 
-    mock_client = Mock()
-    mock_client.invoke.side_effect = mock_invoke
+def _run_flow(initial_prompt: str = "initial prompt") -> dict:
+    """Run all stages on the cached compiled Orchestrator."""
+    compiled = _compiled_orchestrator(initial_prompt)
+    return compiled.invoke({}, config={"recursion_limit": 200})
 
-    with patch("agents.orchestrator.tool.load_config", return_value=config):
-        with patch("agents.orchestrator.tool.validate_config"):
-            orchestrator = Orchestrator(mock_client, "initial prompt")
-            compiled = orchestrator.compile()
-            result = compiled.invoke({}, config={"recursion_limit": 200})
+
+@test_wrapper
+@_runtime
+def test_orchestrator_full_flow_system():
+    """Run full 6-stage flow and verify cross-stage propagation."""
+    mock_client, mock_cli = _prepare_mocks()
+
+    diagnostic_prompts = []
+    integration_prompts = []
+    mock_client.invoke.side_effect = _make_invoke(diagnostic_prompts, integration_prompts)
+
+    result = _run_flow()
 
     assert result["stage_idx"] == 7
 
@@ -120,7 +225,68 @@ def test_orchestrator_full_flow_system():
     ]
 
 
+@test_wrapper
+@_runtime
+def test_orchestrator_prompt_cache_hits():
+    """Replay the full flow through a prompt cache and verify it is served from cache."""
+    mock_client, _ = _prepare_mocks()
+
+    raw_invoke = Mock(side_effect=_make_invoke([], []))
+    cached_invoke = _cached_invoke(raw_invoke)
+    mock_client.invoke.side_effect = cached_invoke
+
+    first = _run_flow()
+    first_calls = raw_invoke.call_count
+    second = _run_flow()
+
+    assert second["current_prompt"] == first["current_prompt"]
+    # The replay sends identical prompts, so nothing reaches the underlying client
+    assert raw_invoke.call_count == first_calls
+
+    info = cached_invoke.cache_info()
+    assert info.hits > 0
+    assert info.hits / (info.hits + info.misses) >= 0.2
+
+
+@test_wrapper
+@_runtime
+def test_orchestrator_flow_latency_budget():
+    """
+    Guard the mocked full flow against extra-LLM-call regressions.
+
+    The median latency is also checked when PROMPT_AGENT_FLOW_BUDGET_MS is set.
+    """
+    mock_client, _ = _prepare_mocks()
+
+    # Keep graph compilation out of the timed runs
+    _compiled_orchestrator("initial prompt")
+
+    timings = []
+    for _ in range(_FLOW_RUNS):
+        diagnostic_prompts = []
+        integration_prompts = []
+        mock_client.invoke.side_effect = _make_invoke(diagnostic_prompts, integration_prompts)
+
+        start = time.perf_counter()
+        _run_flow()
+        timings.append(time.perf_counter() - start)
+
+        # One diagnostic per stage, one integration per stage with questions
+        assert len(diagnostic_prompts) == 6
+        assert len(integration_prompts) == 5
+
+    if _FLOW_BUDGET_S is None:
+        return
+
+    median = statistics.median(timings)
+    assert median <= _FLOW_BUDGET_S, (
+        f"median flow time {median * 1000:.1f}ms exceeds {_FLOW_BUDGET_S * 1000:.0f}ms budget"
+    )
+
+
 if __name__ == "__main__":
     print("Running Orchestrator system tests...\n")
     test_orchestrator_full_flow_system()
+    test_orchestrator_prompt_cache_hits()
+    test_orchestrator_flow_latency_budget()
     print("\nAll tests completed!")